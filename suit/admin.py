@@ -1,10 +1,17 @@
+import operator
+from django.conf import settings
 from django.contrib import admin
 from django.db import models
+from django.utils.encoding import force_str, force_text
+from django.utils.http import RFC3986_SUBDELIMS
+from django.utils import six
 from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+from .compat import quote
 try:
-    from django.urls import reverse_lazy
+    from django.urls import NoReverseMatch, reverse, get_script_prefix, get_urlconf
 except:
-    from django.core.urlresolvers import reverse_lazy
+    from django.core.urlresolvers import NoReverseMatch, reverse, get_script_prefix, get_urlconf
 
 """
 Adapted by using following examples:
@@ -14,15 +21,59 @@ http://stackoverflow.com/a/7192721/641263
 
 link_to_prefix = 'link_to_'
 
+_admin_url_pk_placeholder = 'suit-pk-placeholder'
+_admin_url_templates = {}
+
+
+def _admin_url_template(admin_prefix, app_label, model_name, current_app):
+    """
+    Reverse admin change url once per model and return (prefix, suffix) parts around pk.
+    Returns None if change url doesn't accept placeholder pk, e.g. <int:object_id>
+    """
+    key = (admin_prefix, app_label, model_name, current_app,
+           get_script_prefix(), get_urlconf(), settings.ROOT_URLCONF, get_language())
+    try:
+        return _admin_url_templates[key]
+    except KeyError:
+        pass
+    try:
+        url = reverse(
+            '%s:%s_%s_change' % (admin_prefix, app_label, model_name),
+            args=(_admin_url_pk_placeholder,),
+            current_app=current_app
+        )
+    except NoReverseMatch:
+        template = None
+    else:
+        template = tuple(url.split(_admin_url_pk_placeholder, 1))
+    _admin_url_templates[key] = template
+    return template
+
 
 def get_admin_url(instance, admin_prefix='admin', current_app=None):
+    """
+    Admin change url of instance as plain string, not lazy, as it is rendered right away anyway
+    """
     if not instance.pk:
         return
-    return reverse_lazy(
-        '%s:%s_%s_change' % (admin_prefix, instance._meta.app_label, instance._meta.model_name),
-        args=(instance.pk,),
-        current_app=current_app
-    )
+    template = _admin_url_template(
+        admin_prefix, instance._meta.app_label, instance._meta.model_name, current_app)
+    if template is None:
+        return reverse(
+            '%s:%s_%s_change' % (admin_prefix, instance._meta.app_label, instance._meta.model_name),
+            args=(instance.pk,),
+            current_app=current_app
+        )
+    prefix, suffix = template
+    # Quote pk the same way reverse() does
+    return ''.join((prefix, quote(force_str(instance.pk), safe=RFC3986_SUBDELIMS + '/~:@'), suffix))
+
+
+def is_related_field(name):
+    """
+    Whether list_display field name is a related field or link, e.g. client__name or link_to_client
+    """
+    return name.startswith(link_to_prefix) or ('__' in name and not name.startswith('__'))
 
 
 def get_related_field(name, short_description=None, admin_order_field=None, admin_prefix='admin'):
@@ -34,21 +85,35 @@ def get_related_field(name, short_description=None, admin_order_field=None, admi
     if as_link:
         name = name[len(link_to_prefix):]
     related_names = name.split('__')
+    get_related = operator.attrgetter('.'.join(related_names))
 
-    def getter(self, obj):
-        for related_name in related_names:
+    # Separate getters, so that as_link isn't checked for every rendered cell
+    if as_link:
+        def getter(self, obj):
+            try:
+                obj = get_related(obj)
+            except AttributeError:
+                return None
             if not obj:
-                continue
-            obj = getattr(obj, related_name)
-        if obj and as_link:
-            obj = mark_safe(u'<a href="%s" class="link-with-icon">%s<i class="fa fa-caret-right"></i></a>' % \
-                            (get_admin_url(obj, admin_prefix, current_app=self.admin_site.name), obj))
-        return obj
+                return obj
+            url = get_admin_url(obj, admin_prefix, current_app=self.admin_site.name)
+            # No url for objects without pk, e.g. pk 0 or unsaved instance
+            if url is None:
+                return obj
+            return mark_safe(u''.join((
+                u'<a href="', url, u'" class="link-with-icon">', force_text(obj),
+                u'<i class="fa fa-caret-right"></i></a>')))
+
+        getter.allow_tags = True
+    else:
+        def getter(self, obj):
+            try:
+                return get_related(obj)
+            except AttributeError:
+                return None
 
     getter.admin_order_field = admin_order_field or name
     getter.short_description = short_description or related_names[-1].title().replace('_', ' ')
-    if as_link:
-        getter.allow_tags = True
     return getter
 
 
@@ -57,46 +122,79 @@ class RelatedFieldAdminMetaclass(type(admin.ModelAdmin)):
 
     def __new__(cls, name, bases, attrs):
         new_class = super(RelatedFieldAdminMetaclass, cls).__new__(cls, name, bases, attrs)
+        new_class._suit_select_related = ()
 
-        for field in new_class.list_display:
-            if '__' in field or field.startswith(link_to_prefix):
-                if not hasattr(new_class, field):
-                    setattr(new_class, field, get_related_field(
-                        field, admin_prefix=cls.related_field_admin_prefix))
+        # Skip classes without related fields, e.g. RelatedFieldAdmin itself with ('__str__',)
+        related_fields = [field for field in getattr(new_class, 'list_display', None) or ()
+                          if not callable(field) and is_related_field(field)]
+        if not related_fields:
+            return new_class
+
+        select_related = []
+        for field in related_fields:
+            if not hasattr(new_class, field):
+                setattr(new_class, field, get_related_field(
+                    field, admin_prefix=cls.related_field_admin_prefix))
+
+            # Collect related paths once per class instead of on every request
+            if '__' in field:
+                if field.startswith(link_to_prefix):
+                    field = field[len(link_to_prefix):]
+                related_path = field.rsplit('__', 1)[0]
+                if related_path not in select_related:
+                    select_related.append(related_path)
+        new_class._suit_select_related = tuple(select_related)
 
         return new_class
 
 
-class RelatedFieldAdmin(admin.ModelAdmin):
+class RelatedFieldAdmin(six.with_metaclass(RelatedFieldAdminMetaclass, admin.ModelAdmin)):
     """
     Version of ModelAdmin that can use linked and related fields in list_display, e.g.:
     list_display = ('link_to_user', 'address__city', 'link_to_address__city', 'address__country__country_code')
-    """
-    __metaclass__ = RelatedFieldAdminMetaclass
-
-    def get_queryset(self, request):
-        qs = super(RelatedFieldAdmin, self).get_queryset(request)
-
-        # Include all related fields in queryset
-        select_related = []
-        for field in self.list_display:
-            if '__' in field:
-                if field.startswith(link_to_prefix):
-                    field = field[len(link_to_prefix):]
-                select_related.append(field.rsplit('__', 1)[0])
 
-        # Include all foreign key fields in queryset.
-        # This is based on ChangeList.get_query_set().
-        # We have to duplicate it here because select_related() only works once.
-        # Can't just use list_select_related because we might have multiple__depth__fields it won't follow.
-        model = qs.model
+    Aggregates for list_display can be annotated in one query, instead of querying for every row, e.g.:
+    list_annotations = {'asset_count': Count('assets')}
+    Display method then should read obj.asset_count instead of obj.assets.count()
+    """
+    list_annotations = {}
+
+    def __init__(self, model, admin_site):
+        super(RelatedFieldAdmin, self).__init__(model, admin_site)
+
+        # Foreign keys need the model, so they are added here, once per admin instance.
+        # ChangeList applies list_select_related only if queryset has no select_related() yet,
+        # so related fields are selected in get_queryset(), where select_related() calls chain.
+        select_related = self.get_foreign_key_fields()
+        for field in self._suit_select_related:
+            if field not in select_related:
+                select_related.append(field)
+        self._suit_list_select_related = tuple(select_related)
+
+    def get_foreign_key_fields(self):
+        """
+        Foreign key fields of list_display, including link_to_ fields.
+        This is based on ChangeList.has_related_field_in_list_display().
+        """
+        fields = {field.name: field for field in self.model._meta.get_fields()}
+        foreign_keys = []
         for field_name in self.list_display:
-            try:
-                field = model._meta.get_field(field_name)
-            except models.FieldDoesNotExist:
+            if callable(field_name):
+                continue
+            if field_name.startswith(link_to_prefix):
+                field_name = field_name[len(link_to_prefix):]
+            field = fields.get(field_name)
+            if field is None:
                 continue
 
             if isinstance(field.remote_field, models.ManyToOneRel):
-                select_related.append(field_name)
+                foreign_keys.append(field_name)
+        return foreign_keys
 
-        return qs.select_related(*select_related)
+    def get_queryset(self, request):
+        qs = super(RelatedFieldAdmin, self).get_queryset(request)
+        if self._suit_list_select_related:
+            qs = qs.select_related(*self._suit_list_select_related)
+        if self.list_annotations:
+            qs = qs.annotate(**self.list_annotations)
+        return qs
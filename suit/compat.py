@@ -1,6 +1,13 @@
 try:
     # Python 3.
-    from urllib.parse import parse_qs
+    from urllib.parse import parse_qs, quote
 except ImportError:
     # Python 2.6+
     from urlparse import parse_qs
+    from urllib import quote
+
+try:
+    from types import MappingProxyType
+except ImportError:
+    # Python 2
+    MappingProxyType = dict
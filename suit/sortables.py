@@ -1,9 +1,22 @@
-from copy import deepcopy, copy
+from copy import copy
+from itertools import chain
 from django.contrib import admin
 from django.contrib.admin.views.main import ChangeList
 from django.contrib.contenttypes.admin import GenericTabularInline, GenericStackedInline
+from django.core.exceptions import FieldDoesNotExist
 from django.forms import ModelForm, NumberInput
 from django.db import models
+from django.db.models.functions import Coalesce
+from .compat import MappingProxyType
+
+# Sortable widgets are shared by all forms and must not be modified,
+# form fields take a deepcopy of the widget anyway
+_ORDER_ATTRS = MappingProxyType({'class': 'hidden-xs-up suit-sortable'})
+_STACKED_SORTABLE_ATTRS = MappingProxyType({
+    'class': _ORDER_ATTRS['class'] + ' suit-sortable-stacked',
+    'rowclass': ' suit-sortable-stacked-row',
+})
+_STACKED_SORTABLE_WIDGET = NumberInput(attrs=_STACKED_SORTABLE_ATTRS)
 
 
 class SortableModelAdminBase(object):
@@ -23,8 +36,7 @@ class SortableListForm(ModelForm):
 
     class Meta:
         widgets = {
-            'order': NumberInput(
-                attrs={'class': 'hidden-xs-up suit-sortable'})
+            'order': NumberInput(attrs=_ORDER_ATTRS)
         }
 
 
@@ -35,9 +47,44 @@ class SortableChangeList(ChangeList):
 
     def get_ordering(self, request, queryset):
         if self.model_admin.sortable_is_enabled():
-            return [self.model_admin.sortable, '-' + self.model._meta.pk.name]
+            return self.model_admin.sortable_ordering
         return super(SortableChangeList, self).get_ordering(request, queryset)
 
+    def get_results(self, request):
+        # Defer only the paginated result list, get_queryset() is also used for actions
+        if self.model_admin.sortable_is_enabled():
+            only_fields = self.get_only_fields(self.queryset)
+            if only_fields:
+                self.queryset = self.queryset.only(*only_fields)
+        super(SortableChangeList, self).get_results(request)
+
+    def get_only_fields(self, queryset):
+        """
+        Load only displayed columns, since sortable list shows up to 500 rows per page.
+        Returns None if list_display contains anything else than concrete model fields,
+        e.g. __str__ or methods, which may access any other field.
+        """
+        opts = self.model._meta
+        fields = {self.model_admin.sortable, opts.pk.name}
+        for field_name in chain(self.list_display, self.list_display_links or ()):
+            if field_name == 'action_checkbox':
+                continue
+            if callable(field_name):
+                return None
+            try:
+                field = opts.get_field(field_name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete:
+                return None
+            fields.add(field_name)
+
+        # Deferred fields can't be traversed using select_related()
+        select_related = queryset.query.select_related
+        if isinstance(select_related, dict) and not fields.issuperset(select_related):
+            return None
+        return fields
+
 
 class SortableTabularInlineBase(SortableModelAdminBase):
     """
@@ -76,15 +123,27 @@ class SortableStackedInlineBase(SortableModelAdminBase):
     def __init__(self, *args, **kwargs):
         super(SortableStackedInlineBase, self).__init__(*args, **kwargs)
         self.ordering = (self.sortable,)
+        self._suit_fieldsets = None
 
     def get_fieldsets(self, *args, **kwargs):
+        """
+        Declared fieldsets don't depend on request, so they are normalized only once
+        """
+        if not self.fieldsets:
+            return self.sortable_fieldsets(
+                super(SortableStackedInlineBase, self).get_fieldsets(*args, **kwargs))
+
+        if self._suit_fieldsets is None:
+            self._suit_fieldsets = self.sortable_fieldsets(
+                super(SortableStackedInlineBase, self).get_fieldsets(*args, **kwargs))
+        return self._suit_fieldsets
+
+    def sortable_fieldsets(self, fieldsets):
         """
         Iterate all fieldsets and make sure sortable is in the first fieldset
         Remove sortable from every other fieldset, if by some reason someone
         has added it
         """
-        fieldsets = super(SortableStackedInlineBase, self).get_fieldsets(*args, **kwargs)
-
         sortable_added = False
         for fieldset in fieldsets:
             for line in fieldset:
@@ -105,9 +164,7 @@ class SortableStackedInlineBase(SortableModelAdminBase):
 
     def formfield_for_dbfield(self, db_field, **kwargs):
         if db_field.name == self.sortable:
-            kwargs['widget'] = deepcopy(SortableListForm.Meta.widgets['order'])
-            kwargs['widget'].attrs['class'] += ' suit-sortable-stacked'
-            kwargs['widget'].attrs['rowclass'] = ' suit-sortable-stacked-row'
+            kwargs['widget'] = _STACKED_SORTABLE_WIDGET
         return super(SortableStackedInlineBase, self).formfield_for_dbfield(db_field, **kwargs)
 
 
@@ -135,6 +192,9 @@ class SortableModelAdmin(SortableModelAdminBase, admin.ModelAdmin):
         self._original_exclude = copy(self.exclude)
         self._original_list_per_page = self.list_per_page
 
+        # Change list ordering when sortable is enabled
+        self.sortable_ordering = (self.sortable, '-' + self.model._meta.pk.name)
+
         self.enable_sortable()
 
     def merge_form_meta(self, form):
@@ -186,10 +246,6 @@ class SortableModelAdmin(SortableModelAdminBase, admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         if not obj.pk:
             max_order = obj.__class__.objects.aggregate(
-                models.Max(self.sortable))
-            try:
-                next_order = max_order['%s__max' % self.sortable] + 1
-            except TypeError:
-                next_order = 1
-            setattr(obj, self.sortable, next_order)
+                max_order=Coalesce(models.Max(self.sortable), 0))['max_order']
+            setattr(obj, self.sortable, max_order + 1)
         super(SortableModelAdmin, self).save_model(request, obj, form, change)
@@ -0,0 +1,104 @@
+from django.contrib import admin
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth.models import Group, Permission, User
+from django.db.models import Count
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import translation
+from django.utils.functional import Promise
+from suit.admin import RelatedFieldAdmin, get_admin_url, get_related_field
+try:
+    from django.urls import reverse
+except:
+    from django.core.urlresolvers import reverse
+
+
+class PermissionAdmin(RelatedFieldAdmin):
+    list_display = ('name', 'content_type', 'content_type__app_label', 'link_to_content_type__model')
+    list_annotations = {'group_count': Count('group')}
+
+
+class RelatedFieldAdminTestCase(TestCase):
+    def setUp(self):
+        self.model_admin = PermissionAdmin(Permission, admin.site)
+
+    def test_mro(self):
+        self.assertEqual(RelatedFieldAdmin.__mro__[1], admin.ModelAdmin)
+
+    def test_related_field_getters(self):
+        self.assertTrue(hasattr(PermissionAdmin, 'content_type__app_label'))
+        self.assertTrue(hasattr(PermissionAdmin, 'link_to_content_type__model'))
+
+    def test_select_related(self):
+        self.assertEqual(PermissionAdmin._suit_select_related, ('content_type',))
+        self.assertEqual(self.model_admin._suit_list_select_related, ('content_type',))
+        qs = self.model_admin.get_queryset(None)
+        self.assertEqual(qs.query.select_related, {'content_type': {}})
+
+    def test_select_related_with_subclass_queryset(self):
+        class LogEntryAdmin(RelatedFieldAdmin):
+            list_display = ('object_repr', 'user__email', 'content_type__model')
+
+            def get_queryset(self, request):
+                return super(LogEntryAdmin, self).get_queryset(request).select_related('user')
+
+        request = RequestFactory().get('/')
+        request.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        cl = LogEntryAdmin(LogEntry, admin.site).get_changelist_instance(request)
+        self.assertEqual(cl.queryset.query.select_related, {'user': {}, 'content_type': {}})
+
+    def test_list_annotations(self):
+        permission = Permission.objects.first()
+        Group.objects.create(name='editors').permissions.add(permission)
+        qs = self.model_admin.get_queryset(None)
+        self.assertEqual(qs.get(pk=permission.pk).group_count, 1)
+
+    def test_without_related_fields(self):
+        self.assertEqual(RelatedFieldAdmin._suit_select_related, ())
+
+        class PlainPermissionAdmin(PermissionAdmin):
+            list_display = ('__str__', 'name')
+
+        self.assertEqual(PlainPermissionAdmin._suit_select_related, ())
+
+    def test_related_field_value(self):
+        permission = Permission.objects.select_related('content_type').first()
+        self.assertEqual(self.model_admin.content_type__app_label(permission),
+                         permission.content_type.app_label)
+        self.assertIsNone(self.model_admin.content_type__app_label(Permission()))
+
+    def test_related_field_link(self):
+        user = User.objects.create(username='admin')
+        get_user_link = get_related_field('link_to_user')
+        self.assertTrue(get_user_link.allow_tags)
+        self.assertIn('href="%s"' % reverse('admin:auth_user_change', args=(user.pk,)),
+                      get_user_link(self.model_admin, LogEntry(user=user)))
+
+    def test_related_field_link_without_pk(self):
+        user = User(username='unsaved')
+        self.assertIs(get_related_field('link_to_user')(self.model_admin, LogEntry(user=user)), user)
+
+
+class AdminUrlTestCase(TestCase):
+    def test_get_admin_url(self):
+        user = User.objects.create(username='admin')
+        url = get_admin_url(user)
+        self.assertNotIsInstance(url, Promise)
+        self.assertEqual(url, reverse('admin:auth_user_change', args=(user.pk,)))
+        self.assertIsNone(get_admin_url(User()))
+
+    def test_get_admin_url_integer_pk_url(self):
+        user = User.objects.create(username='admin')
+        get_admin_url(user)
+        with override_settings(ROOT_URLCONF='suit.tests.urls_int_pk'):
+            self.assertEqual(get_admin_url(user), '/custom-admin/auth/user/%s/change/' % user.pk)
+
+    def test_get_admin_url_i18n_patterns(self):
+        user = User.objects.create(username='admin')
+        with override_settings(ROOT_URLCONF='suit.tests.urls_i18n'):
+            for language in ('en', 'de'):
+                with translation.override(language):
+                    self.assertEqual(get_admin_url(user), '/%s/admin/auth/user/%s/change/' % (language, user.pk))
+
+    def test_get_admin_url_quotes_pk(self):
+        group = Group(pk='a b/c')
+        self.assertEqual(get_admin_url(group), reverse('admin:auth_group_change', args=(group.pk,)))
@@ -0,0 +1,91 @@
+from django.contrib import admin
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+from suit.sortables import SortableModelAdmin, SortableStackedInline
+
+
+class PermissionInline(SortableStackedInline):
+    model = Permission
+    sortable = 'codename'
+    fieldsets = [
+        (None, {'fields': ['name', 'codename']}),
+    ]
+
+
+class SortableStackedInlineTestCase(TestCase):
+    def test_get_fieldsets(self):
+        inline = PermissionInline(ContentType, admin.site)
+        fieldsets = inline.get_fieldsets(None)
+        self.assertEqual(fieldsets[0][1]['fields'], ['codename', 'name'])
+        self.assertIs(inline.get_fieldsets(None), fieldsets)
+
+
+class PermissionAdmin(SortableModelAdmin):
+    list_display = ('name', 'codename')
+    sortable = 'codename'
+
+
+class SortableChangeListTestCase(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        self.request.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+
+    def get_changelist(self, admin_class):
+        return admin_class(Permission, admin.site).get_changelist_instance(self.request)
+
+    def test_only_displayed_fields(self):
+        cl = self.get_changelist(PermissionAdmin)
+        self.assertEqual(cl.result_list.query.deferred_loading, ({'id', 'name', 'codename'}, False))
+
+    def test_action_queryset_not_deferred(self):
+        cl = self.get_changelist(PermissionAdmin)
+        self.assertEqual(cl.get_queryset(self.request).query.deferred_loading, (frozenset(), True))
+
+    def test_str_in_list_display(self):
+        class StrPermissionAdmin(PermissionAdmin):
+            list_display = ('__str__', 'codename')
+
+        cl = self.get_changelist(StrPermissionAdmin)
+        self.assertIsNone(cl.get_only_fields(cl.queryset))
+        self.assertEqual(cl.result_list.query.deferred_loading, (frozenset(), True))
+
+    def test_method_in_list_display(self):
+        class MethodPermissionAdmin(PermissionAdmin):
+            list_display = ('name', 'app_label', 'codename')
+
+            def app_label(self, obj):
+                return obj.content_type.app_label
+
+        cl = self.get_changelist(MethodPermissionAdmin)
+        self.assertIsNone(cl.get_only_fields(cl.queryset))
+
+    def test_select_related_not_displayed(self):
+        class RelatedPermissionAdmin(PermissionAdmin):
+            list_select_related = ('content_type',)
+
+        cl = self.get_changelist(RelatedPermissionAdmin)
+        self.assertIsNone(cl.get_only_fields(cl.queryset))
+        self.assertEqual(cl.result_list.query.deferred_loading, (frozenset(), True))
+
+
+class LogEntryAdmin(SortableModelAdmin):
+    list_display = ('object_repr',)
+    sortable = 'action_flag'
+
+
+class SortableModelAdminTestCase(TestCase):
+    def test_save_model_order(self):
+        model_admin = LogEntryAdmin(LogEntry, admin.site)
+        user = User.objects.create(username='admin')
+
+        first = LogEntry(user=user, object_repr='first')
+        model_admin.save_model(None, first, None, False)
+        self.assertEqual(first.action_flag, 1)
+
+        LogEntry.objects.filter(pk=first.pk).update(action_flag=5)
+        second = LogEntry(user=user, object_repr='second')
+        model_admin.save_model(None, second, None, False)
+        self.assertEqual(second.action_flag, 6)
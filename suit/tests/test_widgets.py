@@ -0,0 +1,35 @@
+from django.test import TestCase
+from django.utils import translation
+from django.utils.translation import gettext_lazy
+from suit.widgets import AutosizedTextarea, CharacterCountTextarea, EnclosedInput
+
+
+class WidgetsTestCase(TestCase):
+    def test_autosized_textarea(self):
+        output = AutosizedTextarea().render('description', 'abc')
+        self.assertIn('autosize(document.getElementById(\'id_description\'))', output)
+
+    def test_autosized_textarea_media(self):
+        self.assertEqual(AutosizedTextarea().media._js, ['suit/js/autosize.min.js'])
+        self.assertEqual(CharacterCountTextarea().media._js, ['suit/js/autosize.min.js'])
+
+    def test_character_count_textarea(self):
+        output = CharacterCountTextarea().render('description', 'abc')
+        self.assertIn('django.jQuery(\'#id_description\').suitCharactersCount();', output)
+
+    def test_enclosed_input(self):
+        widget = EnclosedInput(prepend='fa-eur', append='.00')
+        output = widget.render('price', '10')
+        self.assertTrue(output.startswith(
+            '<div class="input-group"><span class="input-group-addon"><i class="fa fa-eur"></i></span><input'))
+        self.assertTrue(output.endswith('<span class="input-group-addon">.00</span></div>'))
+        self.assertEqual(widget.render('price', '10'), output)
+
+    def test_enclosed_input_without_addons(self):
+        output = EnclosedInput().render('price', '10')
+        self.assertTrue(output.startswith('<div class=""><input'))
+
+    def test_enclosed_input_lazy_text(self):
+        widget = EnclosedInput(append=gettext_lazy('Yes'))
+        with translation.override('de'):
+            self.assertIn('<span class="input-group-addon">Ja</span>', widget.render('price', '10'))
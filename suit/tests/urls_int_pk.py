@@ -0,0 +1,12 @@
+from django.conf.urls import include, url
+
+
+def change_view(request, object_id):
+    pass
+
+
+urlpatterns = [
+    url(r'^custom-admin/', include(([
+        url(r'^auth/user/(\d+)/change/$', change_view, name='auth_user_change'),
+    ], 'admin'))),
+]
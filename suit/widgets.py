@@ -1,26 +1,36 @@
-from django import forms
 from django.forms import Textarea, TextInput, ClearableFileInput
+from django.utils.encoding import force_text
+from django.utils.functional import keep_lazy_text
 from django.utils.safestring import mark_safe
 
+# Static HTML parts of widgets, joined with dynamic values on render
+_AUTOSIZE_SCRIPT_PREFIX = "<script type=\"text/javascript\">django.jQuery(function () { autosize(document.getElementById('id_"
+_AUTOSIZE_SCRIPT_SUFFIX = "')); });</script>"
+_CHARACTER_COUNT_SCRIPT_PREFIX = "<script type=\"text/javascript\">django.jQuery(function () { django.jQuery('#id_"
+_CHARACTER_COUNT_SCRIPT_SUFFIX = "').suitCharactersCount(); });</script>"
+_IMAGE_WIDGET_PREFIX = u'<div class="ImageWidget"><div class="float-xs-left"><a href="'
+_IMAGE_WIDGET_IMG = u'" target="_blank"><img src="'
+_IMAGE_WIDGET_IMG_END = u'" width="75"></a></div>'
+_IMAGE_WIDGET_SUFFIX = u'</div>'
+_ENCLOSED_INPUT_OPEN = '<div class="">'
+_ENCLOSED_INPUT_GROUP_OPEN = '<div class="input-group">'
+
 
 class AutosizedTextarea(Textarea):
     """
     AutoSized TextArea - TextArea height dynamically grows based on user input
     """
 
+    class Media:
+        js = ('suit/js/autosize.min.js',)
+
     def __init__(self, attrs=None):
         new_attrs = _make_attrs(attrs, {"rows": 2}, "autosize form-control")
         super(AutosizedTextarea, self).__init__(new_attrs)
 
-    @property
-    def media(self):
-        return forms.Media(js=('suit/js/autosize.min.js',))
-
     def render(self, name, value, attrs=None, renderer=None):
         output = super(AutosizedTextarea, self).render(name, value, attrs,renderer)
-        output += mark_safe(
-            "<script type=\"text/javascript\">django.jQuery(function () { autosize(document.getElementById('id_%s')); });</script>"
-            % name)
+        output += mark_safe(''.join((_AUTOSIZE_SCRIPT_PREFIX, name, _AUTOSIZE_SCRIPT_SUFFIX)))
         return output
 
 
@@ -31,9 +41,7 @@ class CharacterCountTextarea(AutosizedTextarea):
 
     def render(self, name, value, attrs=None, renderer=None):
         output = super(CharacterCountTextarea, self).render(name, value, attrs, renderer)
-        output += mark_safe(
-            "<script type=\"text/javascript\">django.jQuery(function () { django.jQuery('#id_%s').suitCharactersCount(); });</script>"
-            % name)
+        output += mark_safe(''.join((_CHARACTER_COUNT_SCRIPT_PREFIX, name, _CHARACTER_COUNT_SCRIPT_SUFFIX)))
         return output
 
 
@@ -42,9 +50,8 @@ class ImageWidget(ClearableFileInput):
         html = super(ImageWidget, self).render(name, value, attrs,renderer)
         if not value or not hasattr(value, 'url') or not value.url:
             return html
-        html = u'<div class="ImageWidget"><div class="float-xs-left">' \
-               u'<a href="%s" target="_blank"><img src="%s" width="75"></a></div>' \
-               u'%s</div>' % (value.url, value.url, html)
+        html = u''.join((_IMAGE_WIDGET_PREFIX, value.url, _IMAGE_WIDGET_IMG, value.url,
+                         _IMAGE_WIDGET_IMG_END, html, _IMAGE_WIDGET_SUFFIX))
         return mark_safe(html)
 
 
@@ -57,30 +64,28 @@ class EnclosedInput(TextInput):
         """
         :param prepend_class|append_class: CSS class applied to wrapper element. Values: addon or btn
         """
-        self.prepend = prepend
         self.prepend_class = prepend_class
-        self.append = append
         self.append_class = append_class
+        # Enclose once here, render() may be called many times for the same widget
+        self.prepend = self.enclose_value(prepend, prepend_class) if prepend else None
+        self.append = self.enclose_value(append, append_class) if append else None
         super(EnclosedInput, self).__init__(attrs=attrs)
 
+    @keep_lazy_text
     def enclose_value(self, value, wrapper_class):
+        value = force_text(value)
         if value.startswith("fa-"):
-            value = '<i class="fa %s"></i>' % value
-        return '<span class="input-group-%s">%s</span>' % (wrapper_class, value)
+            value = ''.join(('<i class="fa ', value, '"></i>'))
+        return ''.join(('<span class="input-group-', wrapper_class, '">', value, '</span>'))
 
     def render(self, name, value, attrs=None, renderer=None):
         output = super(EnclosedInput, self).render(name, value, attrs, renderer)
-        div_classes = set()
-        if self.prepend:
-            div_classes.add('input-group')
-            self.prepend = self.enclose_value(self.prepend, self.prepend_class)
-            output = ''.join((self.prepend, output))
-        if self.append:
-            div_classes.add('input-group')
-            self.append = self.enclose_value(self.append, self.append_class)
-            output = ''.join((output, self.append))
-
-        return mark_safe('<div class="%s">%s</div>' % (' '.join(div_classes), output))
+        if self.prepend or self.append:
+            div_open = _ENCLOSED_INPUT_GROUP_OPEN
+        else:
+            div_open = _ENCLOSED_INPUT_OPEN
+        return mark_safe(''.join((div_open, force_text(self.prepend or ''), output,
+                                  force_text(self.append or ''), '</div>')))
 
 
 def _make_attrs(attrs, defaults=None, classes=None):